@@ -12,14 +12,15 @@ Ethics: Use only on systems/accounts you own or where you have permission.
 """
 
 import argparse
+import functools
 import itertools
 import json
+import math
 import os
 import random
 import string
 import sys
 import time
-from collections import OrderedDict
 
 # zxcvbn import with fallback message if not installed
 try:
@@ -54,9 +55,16 @@ LEET_MAP = {
     'g': ['9'],
     'z': ['2']
 }
+_LEET_KEYS = frozenset(LEET_MAP)
 
 SPECIALS = ['!', '@', '#', '$', '%', '&', '*', '?']
 
+# precomputed special-char strings of length 1..3, keyed by length
+_SPECIAL_SUFFIXES = {
+    n: tuple(''.join(combo) for combo in itertools.product(SPECIALS, repeat=n))
+    for n in (1, 2, 3)
+}
+
 # Default settings for combinatorics limits (to avoid explosion)
 DEFAULT_LIMITS = {
     "max_results": 50000,      # maximum words to write to file unless overridden
@@ -64,6 +72,14 @@ DEFAULT_LIMITS = {
     "year_range_limit": 30      # maximum years appended (if using a large range)
 }
 
+# Output tuning: buffer size of the output file and number of lines joined and encoded per write
+WRITE_BUFFER_SIZE = 1 << 20
+WRITE_CHUNK_LINES = 4096
+
+# From this max_results on, de-duplicate on 64-bit hash fingerprints instead of keeping every word
+# (only where str hashes are 64 bits wide; narrower hashes would collide too often)
+FINGERPRINT_MIN_RESULTS = 1000000
+
 # -------------------------
 # Utility and generation functions
 # -------------------------
@@ -93,20 +109,33 @@ def analyze_password(password):
             pass
 
     # Fallback simple estimate: character set size * length => bits = length * log2(charset)
+    # single pass collecting character classes: 1=lower, 2=upper, 4=digit, 8=symbol
+    mask = 0
+    for c in password:
+        if c.islower():
+            mask |= 1
+        elif c.isupper():
+            mask |= 2
+        elif c.isdigit():
+            mask |= 4
+        # checked separately: cased non-alphanumerics (e.g. circled letters) also count as symbols
+        if not c.isalnum():
+            mask |= 8
+        if mask == 15:
+            break
     charset = 0
-    if any(c.islower() for c in password):
+    if mask & 1:
         charset += 26
-    if any(c.isupper() for c in password):
+    if mask & 2:
         charset += 26
-    if any(c.isdigit() for c in password):
+    if mask & 4:
         charset += 10
-    if any(not c.isalnum() for c in password):
+    if mask & 8:
         # approximate printable punctuation
         charset += 32
     if charset == 0:
         entropy = 0.0
     else:
-        import math
         entropy = round(len(password) * math.log2(charset), 2)
     # crude scoring
     if entropy < 28:
@@ -129,83 +158,143 @@ def analyze_password(password):
         'matched_sequence': []
     }
 
+def _format_analysis(res):
+    """Format an analyze_password result for display; only the variable-length fields go through json."""
+    return (
+        f"password: {res['password']}\n"
+        f"score: {res['score']}\n"
+        f"guesses: {res['guesses']}\n"
+        f"entropy: {res['entropy']}\n"
+        f"warning: {res['warning']}\n"
+        f"suggestions: {json.dumps(res['suggestions'], default=str)}\n"
+        f"matched_sequence: {json.dumps(res['matched_sequence'], default=str)}"
+    )
+
+@functools.lru_cache(maxsize=4096)
 def make_case_variants(token):
-    """Return case variants of token (lower, upper, capitalize, alt-case)."""
-    variants = {token, token.lower(), token.upper(), token.capitalize()}
+    """Return case variants of token (original, lower, upper, capitalize, alt-case) as a tuple."""
+    # tokens without letters (numbers, symbols) have no other case variants
+    if not any(map(str.isalpha, token)):
+        return (token,)
+    out = []
+    seen = set()
+    add_seen = seen.add
+    app = out.append
+    candidates = [token, token.lower(), token.upper(), token.capitalize()]
     # also include toggled alternating case for short tokens
     if len(token) <= 8:
-        alt = ''.join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(token))
-        variants.add(alt)
-    return sorted(variants)
+        candidates.append(''.join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(token)))
+    for s in candidates:
+        if s not in seen:
+            add_seen(s)
+            app(s)
+    return tuple(out)
+
+@functools.lru_cache(maxsize=8192)
+def _leet_positions(lower_token):
+    """Return (index, substitutions) for every leet-substitutable letter of a lowercased token."""
+    return tuple((i, LEET_MAP[ch]) for i, ch in enumerate(lower_token) if ch in LEET_MAP)
 
 def apply_leets(token, max_variants=8):
-    """Return a set of leetspeak variants of token (limit size)."""
+    """Return a de-duplicated list of leetspeak variants of token (limit size)."""
     # We'll build by replacing some letters with leet substitutions; limit exponential blow-up.
-    positions = []
-    for i, ch in enumerate(token.lower()):
-        if ch in LEET_MAP:
-            positions.append((i, LEET_MAP[ch]))
-    variants = set()
+    # positions only depend on the lowercased token, so case variants share one lookup
+    positions = _leet_positions(token.lower())
+    out = []
+    seen = set()
+    add_seen = seen.add
+    app = out.append
     # always include original
-    variants.add(token)
-    # produce variants by trying 1..k substitutions; cap total results
-    # generate substitution masks
+    add_seen(token)
+    app(token)
+    # produce variants by trying 1..k substitutions (fewest first); cap total results
     max_subs = min(len(positions), 3)  # don't substitute too many
+    arr = list(token)  # reused for every variant, restored after each combination
     for r in range(1, max_subs + 1):
         for combo in itertools.combinations(positions, r):
+            if r == 1:
+                # single substitutions (the common case) need no product
+                (i_, repls), = combo
+                for replacement in repls:
+                    arr[i_] = replacement
+                    s = ''.join(arr)
+                    if s not in seen:
+                        add_seen(s)
+                        app(s)
+                        if len(out) >= max_variants:
+                            return out
+                arr[i_] = token[i_]
+                continue
+            idxs = [pos for pos, _ in combo]
             # for each choice of replacement values
-            lists = []
-            idxs = []
-            for pos, repls in combo:
-                lists.append(repls)
-                idxs.append(pos)
-            for prod in itertools.product(*lists):
-                arr = list(token)
-                for i_, replacement in enumerate(prod):
-                    arr[idxs[i_]] = replacement
-                variants.add(''.join(arr))
-                if len(variants) >= max_variants:
-                    return sorted(variants)
-    return sorted(variants)
+            for prod in itertools.product(*[repls for _, repls in combo]):
+                for i_, replacement in zip(idxs, prod):
+                    arr[i_] = replacement
+                s = ''.join(arr)
+                if s not in seen:
+                    add_seen(s)
+                    app(s)
+                    if len(out) >= max_variants:
+                        return out
+            for i_ in idxs:
+                arr[i_] = token[i_]
+    return out
+
+@functools.lru_cache(maxsize=8)
+def _year_suffixes(start_year, end_year):
+    """Return the year suffixes for [start_year, end_year]: each full year followed by its two-digit form."""
+    suffixes = []
+    for y in range(start_year, end_year + 1):
+        suffixes.append(str(y))
+        suffixes.append(str(y)[-2:])  # two-digit
+    return tuple(suffixes)
 
 def append_years(token, start_year=2000, end_year=2025):
     """Return list of token + year where year in range [start_year, end_year]."""
-    years = []
-    for y in range(start_year, end_year + 1):
-        years.append(f"{token}{y}")
-        years.append(f"{token}{str(y)[-2:]}")  # two-digit
-    return years
+    return [token + s for s in _year_suffixes(start_year, end_year)]
 
 def attach_specials(token, max_suffix=3):
     """Attach 0..max_suffix special chars to token (suffixes and prefixes)."""
-    variants = set()
-    variants.add(token)
+    out = [token]
+    seen = {token}
+    add_seen = seen.add
+    app = out.append
+    pool = _SPECIAL_SUFFIXES
     for n in range(1, max_suffix + 1):
-        for combo in itertools.product(SPECIALS, repeat=n):
-            s = ''.join(combo)
-            variants.add(token + s)
-            variants.add(s + token)
-    return sorted(variants)
+        suffixes = pool.get(n)
+        if suffixes is None:
+            suffixes = (''.join(combo) for combo in itertools.product(SPECIALS, repeat=n))
+        for s in suffixes:
+            for v in (token + s, s + token):
+                if v not in seen:
+                    add_seen(v)
+                    app(v)
+    return out
 
 def generate_combinations(tokens, max_comb=3, max_results=50000):
     """Generate token combinations (permutations) up to length max_comb.
        Returns generator yielding combinations; the output is de-duplicated preserving insertion order.
     """
-    seen = OrderedDict()
+    if max_results <= 0:
+        return
+    seen = set()
+    add = seen.add
+    join = ''.join
     count = 0
     tokens_unique = list(dict.fromkeys([t for t in tokens if t]))  # preserve order, drop empty
     for r in range(1, max_comb + 1):
-        if count >= max_results:
-            break
         # permutations to mimic ordering combinations like JohnSmith vs SmithJohn
-        for perm in itertools.permutations(tokens_unique, r):
-            w = ''.join(perm)
-            if w not in seen:
-                seen[w] = None
-                count += 1
-                yield w
+        for w in map(join, itertools.permutations(tokens_unique, r)):
+            if w in seen:
+                continue
+            add(w)
+            count += 1
+            yield w
             if count >= max_results:
-                break
+                return
+
+class _ResultsCapped(Exception):
+    """Raised inside iter_wordlist once max_results words have been emitted."""
 
 def limit_list(items, limit):
     if limit is None:
@@ -216,7 +305,7 @@ def limit_list(items, limit):
 # Main wordlist builder
 # -------------------------
 
-def build_wordlist(
+def iter_wordlist(
     names=None,
     dates=None,
     pets=None,
@@ -231,18 +320,22 @@ def build_wordlist(
     max_combination=3
 ):
     """
-    Build and return a list of wordlist tokens based on inputs and options.
-    This function is careful about combinatorial explosion by enforcing max_results.
+    Yield de-duplicated wordlist tokens based on inputs and options, in generation order.
+    Variants are streamed as they are produced; only a set of already emitted words is kept.
     """
     max_results = max_results or DEFAULT_LIMITS['max_results']
     tokens = []
+    tokens_seen = set()  # membership test for tokens
+    ts_add = tokens_seen.add
+    t_app = tokens.append
 
     # collect base tokens (strip, unique)
     def extend_unique(lst):
         for x in lst or []:
             s = str(x).strip()
-            if s and s not in tokens:
-                tokens.append(s)
+            if s and s not in tokens_seen:
+                ts_add(s)
+                t_app(s)
 
     extend_unique(names or [])
     extend_unique(dates or [])
@@ -252,76 +345,134 @@ def build_wordlist(
     if include_common:
         extend_unique(COMMON_PASSWORDS)
 
+    # resolve the year window once; combined tokens use the same window
+    sy, ey = start_year, end_year
+    now = time.localtime().tm_year
+    if sy is None:
+        sy = now - 10
+    if ey is None:
+        ey = now + 1
+    # cap year range
+    if (ey - sy) > DEFAULT_LIMITS['year_range_limit']:
+        # shrink to reasonable bound
+        sy = ey - DEFAULT_LIMITS['year_range_limit']
+
     # create variants
-    variants = OrderedDict()
+    seen = set()
+
+    if max_results < FINGERPRINT_MIN_RESULTS or sys.hash_info.width < 64:
+        def emit(candidates):
+            for c in candidates:
+                if c not in seen:
+                    seen.add(c)
+                    yield c
+                    if len(seen) >= max_results:
+                        raise _ResultsCapped
+    else:
+        # large runs: an int fingerprint is much smaller than the word and lets streamed
+        # words be freed; a false duplicate needs a 64-bit hash collision
+        def emit(candidates):
+            for c in candidates:
+                h = hash(c)
+                if h not in seen:
+                    seen.add(h)
+                    yield c
+                    if len(seen) >= max_results:
+                        raise _ResultsCapped
+
+    try:
+        yield from _iter_variants(tokens, emit, leets, append_years_opt, sy, ey,
+                                  attach_specials_opt, max_results, max_combination)
+    except _ResultsCapped:
+        return
+
+def _expand_token(t, leets, append_years_opt, sy, ey, attach_specials_opt):
+    """Return the case/leet/year/special variants of a single base token (may contain duplicates)."""
+    out = []
+    # base case variants
+    for v in make_case_variants(t):
+        out.append(v)
+        # apply_leets only adds variants when v has a substitutable letter
+        if leets and not _LEET_KEYS.isdisjoint(v.lower()):
+            out.extend(apply_leets(v))
+        # years
+        if append_years_opt:
+            out.extend(append_years(v, sy, ey))
+        # specials
+        if attach_specials_opt:
+            out.extend(attach_specials(v, max_suffix=2))
+    return out
+
+def _iter_variants(tokens, emit, leets, append_years_opt, sy, ey,
+                   attach_specials_opt, max_results, max_combination):
+    """Yield the variants of tokens through emit (which de-duplicates and enforces max_results)."""
     # Add single token case/leets/special/year variants
     for t in tokens:
-        # base case variants
-        for v in make_case_variants(t):
-            variants[v] = None
-            if leets:
-                for lv in apply_leets(v):
-                    variants[lv] = None
-            # years
-            if append_years_opt:
-                if start_year is None:
-                    start_year = time.localtime().tm_year - 10
-                if end_year is None:
-                    end_year = time.localtime().tm_year + 1
-                # cap year range
-                if (end_year - start_year) > DEFAULT_LIMITS['year_range_limit']:
-                    # shrink to reasonable bound
-                    start_year = end_year - DEFAULT_LIMITS['year_range_limit']
-                for yv in append_years(v, start_year, end_year):
-                    variants[yv] = None
-            # specials
-            if attach_specials_opt:
-                for sv in attach_specials(v, max_suffix=2):
-                    variants[sv] = None
+        yield from emit(_expand_token(t, leets, append_years_opt, sy, ey, attach_specials_opt))
 
     # include raw tokens too
-    for t in tokens:
-        variants[t] = None
+    yield from emit(tokens)
 
     # Combine tokens (permutations)
-    combined_count = 0
     for combo in generate_combinations(tokens, max_comb=max_combination, max_results=max_results):
         # For each combo, apply some simple variant expansions (case, leet, year)
-        if len(variants) >= max_results:
-            break
         # add plain combo
-        if combo not in variants:
-            variants[combo] = None
+        yield from emit((combo,))
         # small set of variants for combo to avoid explosion
-        if leets:
-            for lv in apply_leets(combo, max_variants=4):
-                variants[lv] = None
+        if leets and not _LEET_KEYS.isdisjoint(combo.lower()):
+            yield from emit(apply_leets(combo, max_variants=4))
         if append_years_opt:
-            # use a small year window for combined tokens
-            sy = (start_year or (time.localtime().tm_year - 5))
-            ey = (end_year or time.localtime().tm_year)
-            for yv in append_years(combo, sy, ey):
-                variants[yv] = None
+            yield from emit(append_years(combo, sy, ey))
         if attach_specials_opt:
-            for sv in attach_specials(combo, max_suffix=1):
-                variants[sv] = None
-        combined_count += 1
+            yield from emit(attach_specials(combo, max_suffix=1))
 
-    # convert to list and cap
-    results = list(variants.keys())
-    if len(results) > max_results:
-        results = results[:max_results]
-    return results
+def build_wordlist(
+    names=None,
+    dates=None,
+    pets=None,
+    custom=None,
+    include_common=True,
+    leets=True,
+    append_years_opt=True,
+    start_year=None,
+    end_year=None,
+    attach_specials_opt=True,
+    max_results=None,
+    max_combination=3
+):
+    """
+    Build and return a list of wordlist tokens based on inputs and options.
+    This function is careful about combinatorial explosion by enforcing max_results.
+    """
+    return list(iter_wordlist(
+        names=names, dates=dates, pets=pets, custom=custom,
+        include_common=include_common,
+        leets=leets,
+        append_years_opt=append_years_opt,
+        start_year=start_year, end_year=end_year,
+        attach_specials_opt=attach_specials_opt,
+        max_results=max_results,
+        max_combination=max_combination
+    ))
 
 def write_wordlist(wordlist, outpath):
-    """Write wordlist (iterable) to outpath (text file)."""
+    """Write wordlist (iterable, consumed lazily) to outpath (text file); return the number of words written."""
     outdir = os.path.dirname(outpath)
     if outdir and not os.path.exists(outdir):
         os.makedirs(outdir, exist_ok=True)
-    with open(outpath, 'w', encoding='utf-8', errors='ignore') as f:
-        for w in wordlist:
-            f.write(w + '\n')
-    return outpath
+    # join and encode lines in small slices and write each slice in one call;
+    # slicing bounds peak memory and the file buffer coalesces the writes
+    it = iter(wordlist)
+    count = 0
+    with open(outpath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        while True:
+            chunk = list(itertools.islice(it, WRITE_CHUNK_LINES))
+            if not chunk:
+                break
+            count += len(chunk)
+            chunk.append('')  # trailing newline
+            f.write('\n'.join(chunk).encode('utf-8', 'ignore'))
+    return count
 
 # -------------------------
 # CLI
@@ -355,7 +506,7 @@ def run_cli(args):
     if args.analyze:
         res = analyze_password(args.analyze)
         print("Password analysis:")
-        print(json.dumps(res, indent=2))
+        print(_format_analysis(res))
         # continue to wordlist generation if other params present
 
     # If any generation parameter is present, generate
@@ -363,7 +514,8 @@ def run_cli(args):
     if generation_requested:
         print("Building wordlist with settings:")
         print(f" names={args.name}, dates={args.date}, pets={args.pet}, custom={args.custom}")
-        wl = build_wordlist(
+        print(f"Writing to {args.output} ...")
+        wl = iter_wordlist(
             names=args.name,
             dates=args.date,
             pets=args.pet,
@@ -377,8 +529,8 @@ def run_cli(args):
             max_results=args.max_results,
             max_combination=args.max_combine
         )
-        print(f"Generated {len(wl)} entries (capped at {args.max_results}). Writing to {args.output} ...")
-        write_wordlist(wl, args.output)
+        count = write_wordlist(wl, args.output)
+        print(f"Generated {count} entries (capped at {args.max_results}).")
         print("Done.")
     else:
         if not args.analyze:
@@ -464,7 +616,7 @@ def run_gui():
             return
         res = analyze_password(pw)
         res_text.insert('end', "Password analysis:\n")
-        res_text.insert('end', json.dumps(res, indent=2) + "\n\n")
+        res_text.insert('end', _format_analysis(res) + "\n\n")
         res_text.see('end')
 
     def do_generate():
@@ -480,7 +632,7 @@ def run_gui():
         except Exception:
             messagebox.showerror("Error", "Start/end year, max results and max combine must be integers.")
             return
-        wl = build_wordlist(
+        wl = iter_wordlist(
             names=names, dates=dates, pets=pets, custom=custom,
             include_common=(not no_common_var.get()),
             leets=(not no_leet_var.get()),
@@ -491,8 +643,8 @@ def run_gui():
             max_combination=mc
         )
         out = output_var.get() or "wordlist.txt"
-        write_wordlist(wl, out)
-        res_text.insert('end', f"Generated {len(wl)} words and saved to {out}\n")
+        count = write_wordlist(wl, out)
+        res_text.insert('end', f"Generated {count} words and saved to {out}\n")
         res_text.see('end')
 
     btn_frame = ttk.Frame(frame)